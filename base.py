@@ -1,16 +1,23 @@
-import json
-from typing import Any, Generic, List, Sequence, Tuple, Type, TypeVar, cast
+from functools import lru_cache
+from itertools import count
+from typing import (Any, Callable, Dict, FrozenSet, Generic, List, Optional,
+                    Sequence, Tuple, Type, TypeVar, cast)
 
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel, Field, ValidationError
-from sqlalchemy import Select, desc, func, select, text
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from pydantic.fields import FieldInfo
+from sqlalchemy import Select, desc, func, lambda_stmt, select
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import functions
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from app.database.base_model import BaseModel as ORMBaseModel
 from app.utils.base_schema import BaseSchema
 
-from .schema import BaseFilterSchema, FilterFieldInfo, LookupInfo
+from .schema import (BaseFilterSchema, FilterFieldInfo, LookupInfo,
+                     _get_validator)
 
 _OBM = TypeVar('_OBM', bound=ORMBaseModel)
 _BS = TypeVar('_BS', bound=BaseSchema)
@@ -26,12 +33,96 @@ ORM_LOOKUP_MAPPING = {
     'regexp': 'regexp_match'
 }
 
+LIST_LOOKUPS = frozenset(('in_', 'not_in'))
 
-class BasePaginator(BaseModel, Generic[_BS]):
+ORDER_DIRECTIONS = {
+    '-': 'desc',
+    '+': 'asc'
+}
+
+# Each generated lambda must get a structurally unique code object:
+# SQLAlchemy's lambda cache keys on code-object equality, and two evals
+# of identical source compare equal. Embedding a fresh global name in
+# the source keeps the cache entries apart.
+_criteria_counter = count()
+
+
+@lru_cache(maxsize=None)
+def _predicate_criteria(column: InstrumentedAttribute[Any], lookup: str):
+    operator = getattr(column, lookup)
+
+    name = f'_criteria_{next(_criteria_counter)}'
+    return eval(
+        f"lambda value: lambda s: s.filter({name}(value))",
+        {name: operator}
+    )
+
+
+@lru_cache(maxsize=None)
+def _order_criteria(column: InstrumentedAttribute[Any], direction: str):
+    expression = getattr(column, direction)()
+
+    name = f'_criteria_{next(_criteria_counter)}'
+    return eval(
+        f"lambda s: s.order_by({name})",
+        {name: expression}
+    )
+
+
+@lru_cache(maxsize=None)
+def _search_criteria(search_columns: Tuple[InstrumentedAttribute[Any], ...]):
+    concat_expr = functions.concat(*search_columns)
+
+    def _apply(s: Select[Any], search_query: Any) -> Select[Any]:
+        return s.order_by(desc(func.similarity(concat_expr, search_query)))
+
+    name = f'_criteria_{next(_criteria_counter)}'
+    return eval(
+        f"lambda search_query: lambda s: {name}(s, search_query)",
+        {name: _apply}
+    )
+
+
+@lru_cache(maxsize=None)
+def _search_column_criteria(orm_model: Type[Any], column_name: str):
+    # The column is resolved here, inside the cache, on purpose: an
+    # InstrumentedAttribute stored as a bare class attribute of the
+    # filter would act as a data descriptor on instance access and blow
+    # up against the unmapped filter instance.
+    column = getattr(orm_model, column_name)
+
+    def _apply(s: Select[Any], search_query: Any) -> Select[Any]:
+        # column %> q filters by word_similarity above the
+        # pg_trgm.word_similarity_threshold GUC and is served by the
+        # trigram index; column <->> q is the matching distance, so
+        # best matches order first ascending.
+        return (
+            s
+            .where(column.op('%>')(search_query))
+            .order_by(column.op('<->>')(search_query))
+        )
+
+    name = f'_criteria_{next(_criteria_counter)}'
+    return eval(
+        f"lambda search_query: lambda s: {name}(s, search_query)",
+        {name: _apply}
+    )
+
+
+class _PaginationIn(BaseModel):
     page: int = Field(default=0, ge=0)
     per_page: int = Field(default=10, ge=1, le=100)
+
+
+_PAGINATION_ADAPTER: TypeAdapter[_PaginationIn] = TypeAdapter(_PaginationIn)
+
+
+class BasePaginator(_PaginationIn, Generic[_BS]):
     results: Sequence[_BS]
 
+    def to_response(self) -> ORJSONResponse:
+        return ORJSONResponse(self.model_dump(mode='json'))
+
 _BP = TypeVar('_BP', bound=BasePaginator[Any])
 
 class BaseFilter(Generic[_OBM, _BS, _BP]):
@@ -40,13 +131,56 @@ class BaseFilter(Generic[_OBM, _BS, _BP]):
     ordering_param: str = 'order_by'
     search_param: str = 'search'
     default_ordering: str = 'id'
+    search_column: Optional[str] = None
     paginator_class: Type[_BP]
 
+    _reserved_params: FrozenSet[str]
+    _allowed_fields: FrozenSet[str]
+    _field_infos: Dict[str, FieldInfo]
+    _search_fields: Tuple[str, ...]
+    _orderable_fields: FrozenSet[str]
+    _orm_columns: Dict[str, InstrumentedAttribute[Any]]
+    _predicate_builders: Dict[Tuple[str, str], Callable[[Any], Any]]
+    _search_columns: Tuple[InstrumentedAttribute[Any], ...]
+
     def __init_subclass__(cls) -> None:
         for field in ('orm_model', 'schema'):
             if field not in cls.__dict__:
                 raise ValueError(f"'{field}' class attribute is required")
-            
+
+        cls._reserved_params = frozenset((
+            cls.ordering_param,
+            cls.search_param,
+            'page',
+            'per_page',
+        ))
+        cls._allowed_fields = frozenset(cls.schema.model_fields)
+        cls._field_infos = dict(cls.schema.model_fields)
+        cls._search_fields = tuple(
+            key for key, value
+            in cls.schema.model_fields.items()
+            if cast(FilterFieldInfo, value).searchable
+        )
+        cls._orderable_fields = frozenset(
+            key for key, value
+            in cls.schema.model_fields.items()
+            if cast(FilterFieldInfo, value).orderable
+        )
+        cls._orm_columns = {
+            field_name: getattr(cls.orm_model, field_name)
+            for field_name
+            in cls.schema.model_fields
+        }
+        cls._predicate_builders = {
+            (field_name, lookup): _predicate_criteria(column, lookup)
+            for field_name, column in cls._orm_columns.items()
+            for lookup in (*ORM_LOOKUP_MAPPING.values(), '__eq__')
+        }
+        cls._search_columns = tuple(
+            cls._orm_columns[field_name]
+            for field_name
+            in cls._search_fields
+        )
         return super().__init_subclass__()
 
     def __init__(
@@ -54,154 +188,141 @@ class BaseFilter(Generic[_OBM, _BS, _BP]):
             request: Request
         ) -> None:
         self.request = request
-        
-        self._query = select(self.orm_model)
-        
+        self._qp = dict(request.query_params)
+
+        orm_model = self.orm_model
+        self._query = lambda_stmt(lambda: select(orm_model))
+
         try:
-            self.paginator = self.paginator_class.model_validate(
-                {**self.request.query_params, 'results': []}
-            )
+            self.paginator = _PAGINATION_ADAPTER.validate_python(self._qp)
 
         except ValidationError as e:
-            raise self.get_exception(*json.loads(e.json(include_url=False)))
+            raise self.get_exception(*e.errors(include_url=False))
     
     @staticmethod
     def get_exception(*errors: str):
         return RequestValidationError(errors) 
 
     def inject_query(self, query: Select[Tuple[_OBM]]):
-        self._query = query
+        self._query = lambda_stmt(lambda: query, track_on=(query,))
         return self
 
     def filter(self):
         lookups: List[LookupInfo] = []
+        errors: List[Any] = []
 
-        for key, value in self.request.query_params.items():
-            if key in (
-                    self.ordering_param,
-                    self.search_param,
-                    'page',
-                    'per_page',
-            ):
+        for key, value in self._qp.items():
+            if key in self._reserved_params:
                 continue
 
-            try:
-                field_name, query_lookup = key.split('__')
-                try:
-                    lookup = ORM_LOOKUP_MAPPING[query_lookup]
-                except KeyError:
-                    raise self.get_exception(f"Unknown lookup '{query_lookup}'")
-
-            except ValueError:
+            head, sep, tail = key.rpartition('__')
+            if sep and tail in ORM_LOOKUP_MAPPING:
+                field_name, lookup = head, ORM_LOOKUP_MAPPING[tail]
+            else:
                 field_name, lookup = key, '__eq__'
-            
-            if field_name not in self.schema.model_fields:
+
+            if field_name not in self._allowed_fields:
                 raise self.get_exception(f"Unknown filtering field '{field_name}'")
 
-            lookups.append(LookupInfo(field_name, lookup, value))
-    
-        try:
-            validated_filter = self.schema.model_validate(
-                obj={
-                    lookup.field_name: lookup.value
-                    for lookup
-                    in lookups
-                },
-                context={
-                    lookup.field_name: lookup.lookup
-                    for lookup
-                    in lookups
-                }
+            is_list = lookup in LIST_LOOKUPS
+            adapter = getattr(
+                self._field_infos[field_name],
+                'list_adapter' if is_list else 'scalar_adapter',
+                None
             )
+            if adapter is None:
+                adapter = _get_validator(self.schema, field_name, is_list)
+
+            try:
+                validated = adapter.validate_python(
+                    value.split(',') if is_list else value
+                )
+
+            except ValidationError as e:
+                for error in e.errors(include_url=False):
+                    error['loc'] = (field_name, *error['loc'])
+                    errors.append(error)
+                continue
+
+            lookups.append(LookupInfo(field_name, lookup, validated))
+
+        if errors:
+            raise self.get_exception(*errors)
+
+        if not lookups:
+            return self
 
-        except ValidationError as e:
-            raise self.get_exception(*json.loads(e.json(include_url=False)))
-        
         for lookup in lookups:
-            model_field = getattr(self.orm_model, lookup.field_name)
-            self._query = self._query.filter(
-                getattr(model_field, lookup.lookup)(getattr(validated_filter, lookup.field_name))
+            self._query = self._query.add_criteria(
+                self._predicate_builders[
+                    (lookup.field_name, lookup.lookup)
+                ](lookup.value)
             )
-        
+
         return self
     
     def search(self):
-        seqrch_query = self.request.query_params.get(self.search_param)
-        if not seqrch_query:
+        search_query = self._qp.get(self.search_param)
+        if not search_query:
             return self
 
-        search_fields = [
-            key for key, value
-            in self.schema.model_fields.items()
-            if cast(FilterFieldInfo, value).searchable
-        ]
-
-        pk_field = getattr(self.orm_model, 'id')
-        sq = select(
-            pk_field,
-            func.similarity(
-                functions.concat(
-                    *[
-                        getattr(self.orm_model, field_name)
-                        for field_name
-                        in search_fields
-                    ]
-                ),
-                seqrch_query
-            ).label('result')
-        ).subquery('a')
-    
-        self._query = (
-            self._query
-            .join(sq, pk_field == text('a.id'))
-            .order_by(desc(text('result')))
-        )
+        if self.search_column is not None:
+            self._query = self._query.add_criteria(
+                _search_column_criteria(
+                    self.orm_model, self.search_column
+                )(search_query)
+            )
+
+        else:
+            self._query = self._query.add_criteria(
+                _search_criteria(self._search_columns)(search_query)
+            )
 
         return self
 
     def order(self):
-        order_by = self.request.query_params.get(self.ordering_param)
+        order_by = self._qp.get(self.ordering_param)
         if not order_by:
             order_by = self.default_ordering
         
-        if order_by[0] == '-':
-            order, field_name = 'desc', order_by[1:]
-        else:
-            order = 'asc'
+        sign = order_by[0]
+        order = ORDER_DIRECTIONS.get(sign, 'asc')
+        field_name = order_by[1:] if sign in ORDER_DIRECTIONS else order_by
 
-            if order_by[0] == '+':
-                field_name = order_by[1:]
-            else:
-                field_name = order_by
-        
-        if field_name not in self.schema.model_fields:
+
+        if field_name not in self._allowed_fields:
             raise self.get_exception(f"Unknown ordering field '{field_name}'")
-        
-        order_field = cast(FilterFieldInfo, self.schema.model_fields[field_name])
-        if not order_field.orderable:
+
+        if field_name not in self._orderable_fields:
             raise self.get_exception(f"Ordering by '{field_name}' is not permitted")
 
-        model_field = getattr(self.orm_model, field_name)
-        self._query = self._query.order_by(getattr(model_field, order)())
+        self._query = self._query.add_criteria(
+            _order_criteria(self._orm_columns[field_name], order)
+        )
 
         return self
-    
+
     def offset(self):
-        self._query = self._query.offset((self.paginator.page)*self.paginator.per_page)
+        offset = self.paginator.page*self.paginator.per_page
+        self._query += lambda s: s.offset(offset)
         return self
 
     def limit(self):
-        self._query = self._query.limit(self.paginator.per_page)
+        limit = self.paginator.per_page
+        self._query += lambda s: s.limit(limit)
         return self
 
     def full(self):
         return self.filter().search().order().offset().limit()
 
-    def get_query(self) -> Select[Tuple[_OBM]]:
+    def get_query(self) -> StatementLambdaElement:
         return self._query
 
     def get_response(self, scalars: Sequence[_BS]) -> _BP:
-        return self.paginator_class(
+        # model_construct skips validation: page/per_page are already
+        # validated ints and scalars must be schema instances built by
+        # the caller.
+        return self.paginator_class.model_construct(
             page=self.paginator.page,
             per_page=self.paginator.per_page,
             results=scalars
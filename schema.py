@@ -1,74 +1,59 @@
-from typing import Any, List, NamedTuple, cast
+from functools import lru_cache
+from typing import Any, List, Optional, Type, cast
 
 import typing_extensions
-from pydantic import (BaseModel, FieldValidationInfo, ValidationError,
-                      create_model, field_validator)
+from pydantic import BaseModel, TypeAdapter
 from pydantic.fields import FieldInfo
 from pydantic.fields import \
     _FromFieldInfoInputs as _BaseFromFieldInfoInputs  # type: ignore
-from pydantic_core import InitErrorDetails, PydanticUndefined
+from pydantic_core import PydanticUndefined
 from typing_extensions import Unpack
 
 # TODO
 # what if field is repeated?
 
 
-class LookupInfo(NamedTuple):
-    field_name: str
-    lookup: str
-    value: Any
+class LookupInfo:
+    __slots__ = (
+        'field_name',
+        'lookup',
+        'value'
+    )
+
+    def __init__(self, field_name: str, lookup: str, value: Any) -> None:
+        self.field_name = field_name
+        self.lookup = lookup
+        self.value = value
+
+
+@lru_cache(maxsize=None)
+def _get_validator(
+        cls: Type['BaseFilterSchema'],
+        field_name: str,
+        is_list: bool
+) -> TypeAdapter[Any]:
+    InitialTypeAnnotation = cls.model_fields[field_name].annotation
+
+    if InitialTypeAnnotation is None:
+        raise ValueError(f"Unknown field type")
+
+    if is_list:
+        TypeAnnotation = cast(List[Any], List[InitialTypeAnnotation])
+    else:
+        TypeAnnotation = InitialTypeAnnotation
+
+    return TypeAdapter(TypeAnnotation)
 
 
 class BaseFilterSchema(BaseModel):
-    @field_validator('*', mode='plain')
     @classmethod
-    def name_must_contain_space(cls, v: str, info: FieldValidationInfo) -> Any:
-        InitialTypeAnnotation = cls.model_fields[info.field_name].annotation
-        
-        if InitialTypeAnnotation is None:
-            raise ValueError(f"Unknown field type")
-
-        if not info.context:
-            raise ValueError(f"Context with lookups is required")
-        
-        lookup = info.context.get(info.field_name)
-
-        if lookup in ('in_', 'not_in'):
-            TypeAnnotation = cast(List[Any], List[InitialTypeAnnotation])
-            value_to_validate = v.split(',')
-
-        else:
-            TypeAnnotation = InitialTypeAnnotation
-            value_to_validate = v
-
-        ValidationModel = create_model(
-            'ValidationModel',
-            __config__=None,
-            __base__=None,
-            __module__=__name__,
-            __validators__=None,
-            __cls_kwargs__=None,
-            **{
-                info.field_name: (TypeAnnotation, ...)
-            }
-        )
-
-        try:
-            validated = ValidationModel.model_validate(
-                {info.field_name: value_to_validate}
-            )
-        except ValidationError as e:
-            errors: List[InitErrorDetails] = []
-            for error in e.errors(include_url=False):
-                error['loc'] = error['loc'][1:]
-                errors.append(InitErrorDetails(error)) # type: ignore
-
-            raise ValidationError.from_exception_data(
-                e.title,
-                line_errors=errors
-            )
-        
-        return getattr(validated, info.field_name)
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+
+        for field_name, info in cls.model_fields.items():
+            if isinstance(info, FilterFieldInfo):
+                info.scalar_adapter = _get_validator(cls, field_name, False)
+                info.list_adapter = _get_validator(cls, field_name, True)
 
 
 class _FromFieldInfoInputs(_BaseFromFieldInfoInputs, total=False):
@@ -79,12 +64,16 @@ class _FromFieldInfoInputs(_BaseFromFieldInfoInputs, total=False):
 class FilterFieldInfo(FieldInfo):
     __slots__ = (
         'orderable',
-        'searchable'
+        'searchable',
+        'scalar_adapter',
+        'list_adapter'
     )
 
     def __init__(self, **kwargs: Unpack[_FromFieldInfoInputs]) -> None:
         self.orderable = kwargs.pop('orderable', True)
         self.searchable = kwargs.pop('searchable', True)
+        self.scalar_adapter: Optional[TypeAdapter[Any]] = None
+        self.list_adapter: Optional[TypeAdapter[Any]] = None
         super().__init__(**kwargs)
 
     @classmethod
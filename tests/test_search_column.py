@@ -0,0 +1,72 @@
+from typing import Optional
+
+from sqlalchemy import Integer, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Mapped, mapped_column
+from starlette.datastructures import QueryParams
+
+from app.database.base_model import BaseModel as ORMBaseModel
+from app.utils.base_schema import BaseSchema
+
+from ..base import BaseFilter, BasePaginator
+from ..schema import BaseFilterSchema, FilterField
+
+
+class _SearchUser(ORMBaseModel):
+    __tablename__ = 'filter_tests_search_users'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+    searchable_text: Mapped[str] = mapped_column(String)
+
+
+class _SearchUserOut(BaseSchema):
+    id: int
+    name: str
+
+
+class _SearchUserFilterSchema(BaseFilterSchema):
+    id: Optional[int] = FilterField()
+    name: Optional[str] = FilterField()
+
+
+class _SearchUserPaginator(BasePaginator[_SearchUserOut]):
+    pass
+
+
+class _SearchUserFilter(
+    BaseFilter[_SearchUser, _SearchUserOut, _SearchUserPaginator]
+):
+    orm_model = _SearchUser
+    schema = _SearchUserFilterSchema
+    paginator_class = _SearchUserPaginator
+    search_column = 'searchable_text'
+
+
+class _FakeRequest:
+    def __init__(self, params: dict) -> None:
+        self.query_params = QueryParams(params)
+
+
+def _compiled_search(term: str):
+    flt = _SearchUserFilter(_FakeRequest({'search': term}))
+    flt.filter().search()
+    return flt.get_query()._resolved.compile(
+        dialect=postgresql.dialect(paramstyle='named')
+    )
+
+
+def test_search_column_builds_indexed_predicate():
+    compiled = _compiled_search('foo')
+    sql = str(compiled)
+
+    assert compiled.params['search_query_1'] == 'foo'
+    assert 'searchable_text %> :search_query_1' in sql
+    assert 'searchable_text <->> :search_query_1' in sql
+
+
+def test_search_column_rebinds_term_on_cache_hit():
+    _compiled_search('foo')
+    compiled = _compiled_search('bar')
+
+    assert compiled.params['search_query_1'] == 'bar'